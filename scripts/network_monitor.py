@@ -7,16 +7,225 @@ Perfect for testing remote desktop performance
 
 import asyncio
 import json
+import logging
+import os
 import time
-import statistics
+import struct
 import subprocess
 import platform
+import queue
+import re
 import socket
+import sys
 import threading
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import argparse
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+logger = logging.getLogger(__name__)
+
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+# RTT reported by the ping command, e.g. "time=12.3 ms" or Windows' "time<1ms"
+_PING_RE = re.compile(rb"time[=<]([\d.]+)\s*ms")
+# SO_LINGER with a zero timeout: close() sends RST and skips TIME_WAIT
+_LINGER_RESET = struct.pack("ii", 1, 0)
+TCP_TARGETS = (
+    ("google.com", 80),
+    ("github.com", 443),
+    ("localhost", 9000)  # Our WebSocket server
+)
+RESULTS_WINDOW = 3600  # most recent test results kept in memory
+LATENCY_ARRAY_SIZE = 8192  # initial per-target latency samples, doubled when full
+DNS_CACHE_TTL = 15 * 60  # seconds
+
+
+def _fmt_ts(ns: int) -> str:
+    """Format a time.time_ns() value as a local ISO 8601 timestamp"""
+    return datetime.fromtimestamp(ns / 1e9).astimezone().isoformat()
+
+
+def _icmp_checksum(data: bytes) -> int:
+    """Internet checksum (RFC 1071) of an ICMP packet"""
+    if len(data) % 2:
+        data += b"\x00"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+class IcmpUnavailable(Exception):
+    """Raised when this system does not allow opening an ICMP socket"""
+
+
+class IcmpPinger:
+    """Async ICMP echo client sharing a single socket across in-flight pings"""
+
+    def __init__(self):
+        self._sock: Optional[socket.socket] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ident = os.getpid() & 0xFFFF
+        self._seq = 0
+        self._pending: Dict[Tuple[int, int], Tuple[asyncio.Future, float]] = {}
+
+    def _open(self):
+        """Open a raw ICMP socket, falling back to unprivileged datagram ICMP on Linux"""
+        try:
+            try:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+            except OSError:
+                if not sys.platform.startswith("linux"):
+                    raise
+                sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+                try:
+                    # The kernel rewrites the identifier to the socket's "port"
+                    sock.bind(("", 0))
+                    self._ident = sock.getsockname()[1] & 0xFFFF
+                except OSError:
+                    sock.close()
+                    raise
+        except OSError as e:
+            raise IcmpUnavailable(e) from e
+
+        sock.setblocking(False)
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_reader(sock.fileno(), self._on_readable)
+        except (NotImplementedError, OSError) as e:
+            sock.close()
+            raise IcmpUnavailable(e) from e
+
+        self._sock = sock
+        self._loop = loop
+
+    def _on_readable(self):
+        """Drain pending replies and resolve the matching futures"""
+        while True:
+            try:
+                packet, _ = self._sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+
+            received_at = time.perf_counter()
+            # Raw sockets deliver the IPv4 header, Linux datagram sockets do not.
+            # An echo reply starts with type 0, so a leading version nibble of 4 means a header
+            offset = (packet[0] & 0x0F) * 4 if packet and packet[0] >> 4 == 4 else 0
+            if len(packet) < offset + 8:
+                continue
+
+            icmp_type, _, _, ident, seq = struct.unpack("!BBHHH", packet[offset:offset + 8])
+            if icmp_type != ICMP_ECHO_REPLY:
+                continue
+
+            entry = self._pending.pop((ident, seq), None)
+            if entry is None:
+                continue
+
+            future, sent_at = entry
+            if not future.done():
+                future.set_result((received_at - sent_at) * 1000)
+
+    async def ping(self, host: str, timeout: float = 3.0) -> Optional[float]:
+        """Send one echo request and return the RTT in milliseconds, or None on timeout"""
+        if self._sock is None:
+            self._open()
+
+        self._seq = (self._seq + 1) & 0xFFFF
+        key = (self._ident, self._seq)
+
+        header = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, 0, *key)
+        payload = b"pyrosvisual-ping"
+        checksum = _icmp_checksum(header + payload)
+        packet = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, checksum, *key) + payload
+
+        future = self._loop.create_future()
+        self._pending[key] = (future, time.perf_counter())
+        try:
+            self._sock.sendto(packet, (socket.gethostbyname(host), 0))
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self._pending.pop(key, None)
+
+    def close(self):
+        """Unregister the reader and close the socket"""
+        if self._sock is None:
+            return
+        self._loop.remove_reader(self._sock.fileno())
+        self._sock.close()
+        self._sock = None
+        for future, _ in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+
+
+class CachingResolver:
+    """Non-blocking IPv4 resolver with a TTL cache and coalesced concurrent lookups"""
+
+    def __init__(self, ttl: float = DNS_CACHE_TTL, executor: Optional[Executor] = None):
+        self.ttl = ttl
+        self._executor = executor
+        self._cache: Dict[str, Tuple[str, float]] = {}
+        self._pending: Dict[str, asyncio.Future] = {}
+
+    async def lookup(self, host: str) -> str:
+        """Resolve a host without consulting the cache, refreshing the cached entry"""
+        loop = asyncio.get_running_loop()
+        ip = await loop.run_in_executor(self._executor, socket.gethostbyname, host)
+        self._cache[host] = (ip, time.monotonic() + self.ttl)
+        return ip
+
+    async def resolve(self, host: str) -> str:
+        """Return the IPv4 address for a host, hitting DNS only when the entry is missing or stale"""
+        entry = self._cache.get(host)
+        if entry is not None and entry[1] > time.monotonic():
+            return entry[0]
+
+        # Another task is already resolving this host, share its result
+        pending = self._pending.get(host)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[host] = future
+        try:
+            ip = await self.lookup(host)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited placeholder does not log a warning
+            future.exception()
+            raise
+        else:
+            future.set_result(ip)
+            return ip
+        finally:
+            del self._pending[host]
+
+
 class NetworkMonitor:
     def __init__(self, targets: List[str] = None, interval: float = 1.0):
         self.targets = targets or [
@@ -26,7 +235,37 @@ class NetworkMonitor:
             "localhost"  # Local server
         ]
         self.interval = interval
-        self.results = []
+        self._dns_targets = self.targets[:2]  # DNS timing covers the first 2 targets
+        self._tcp_keys = [f"{host}:{port}" for host, port in TCP_TARGETS]
+        # Every tick copies this instead of building the nested result dicts from scratch
+        self._result_template = {
+            "ts_ns": None,
+            "ping_results": dict.fromkeys(self.targets),
+            "tcp_results": dict.fromkeys(self._tcp_keys),
+            "bandwidth": None,
+            "dns_resolution": dict.fromkeys(self._dns_targets)
+        }
+        self._pinger = IcmpPinger()
+        # Dedicated DNS threads so lookups never queue behind other executor work
+        self._dns_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="dns")
+        self._resolver = CachingResolver(executor=self._dns_pool)
+        self._icmp_available = True
+        # Fallback ping command, Windows takes the timeout in milliseconds
+        if platform.system().lower() == "windows":
+            self._ping_argv = ("ping", "-n", "1", "-w")
+            self._ping_timeout_mul = 1000
+        else:
+            self._ping_argv = ("ping", "-c", "1", "-W")
+            self._ping_timeout_mul = 1
+        self._session = None
+        self.results = deque(maxlen=RESULTS_WINDOW)
+        self._latency_sum = 0.0
+        self._latency_n = 0
+        # Full-run per-target ping history, NaN marks a lost ping
+        self._latency_arr = {
+            target: np.empty(LATENCY_ARRAY_SIZE, dtype=np.float32) for target in self.targets
+        } if np is not None else {}
+        self._latency_idx = {target: 0 for target in self.targets}
         self.running = False
         self.stats = {
             "total_tests": 0,
@@ -40,15 +279,26 @@ class NetworkMonitor:
 
     async def ping_host(self, host: str, timeout: float = 3.0) -> Optional[float]:
         """Ping a host and return latency in milliseconds"""
+        if self._icmp_available:
+            try:
+                ip = await self._resolver.resolve(host)
+                return await self._pinger.ping(ip, timeout)
+            except IcmpUnavailable as e:
+                # No ICMP socket access on this system, use the ping binary instead
+                logger.warning("ICMP sockets unavailable (%s), falling back to ping command", e)
+                self._icmp_available = False
+            except OSError as e:
+                logger.debug("ping %s failed: %s", host, e)
+                return None
+
+        return await self._ping_subprocess(host, timeout)
+
+    async def _ping_subprocess(self, host: str, timeout: float = 3.0) -> Optional[float]:
+        """Ping a host using the system ping command"""
         try:
-            system = platform.system().lower()
-            
-            if system == "windows":
-                cmd = ["ping", "-n", "1", "-w", str(int(timeout * 1000)), host]
-            else:
-                cmd = ["ping", "-c", "1", "-W", str(int(timeout)), host]
+            cmd = (*self._ping_argv, str(int(timeout * self._ping_timeout_mul)), host)
             
-            start_time = time.time()
+            start_time = time.perf_counter()
             process = await asyncio.create_subprocess_exec(
                 *cmd,
                 stdout=asyncio.subprocess.PIPE,
@@ -61,116 +311,183 @@ class NetworkMonitor:
             )
             
             if process.returncode == 0:
-                latency = (time.time() - start_time) * 1000
+                match = _PING_RE.search(stdout)
+                if match:
+                    return float(match.group(1))
+                # Unrecognized output (e.g. busybox or localized ping), fall back to wall-clock time
+                latency = (time.perf_counter() - start_time) * 1000
                 return latency
             else:
                 return None
                 
-        except (asyncio.TimeoutError, Exception) as e:
-            print(f"❌ Ping failed for {host}: {e}")
+        except (asyncio.TimeoutError, OSError) as e:
+            logger.debug("ping %s failed: %s", host, e)
             return None
 
     async def test_tcp_connection(self, host: str, port: int = 80, timeout: float = 3.0) -> Optional[float]:
         """Test TCP connection speed"""
         try:
-            start_time = time.time()
+            ip = await self._resolver.resolve(host)
+            loop = asyncio.get_running_loop()
             
-            reader, writer = await asyncio.wait_for(
-                asyncio.open_connection(host, port),
-                timeout=timeout
-            )
-            
-            latency = (time.time() - start_time) * 1000
-            writer.close()
-            await writer.wait_closed()
+            # A bare non-blocking socket is enough to time the handshake
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+                sock.setblocking(False)
+                # Probes reconnect every interval, don't leave TIME_WAIT sockets behind
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, _LINGER_RESET)
+                start_time = time.perf_counter()
+                await asyncio.wait_for(loop.sock_connect(sock, (ip, port)), timeout=timeout)
+                latency = (time.perf_counter() - start_time) * 1000
             
             return latency
             
-        except Exception as e:
-            print(f"❌ TCP connection failed for {host}:{port}: {e}")
+        except (asyncio.TimeoutError, OSError) as e:
+            logger.debug("TCP connection to %s:%d failed: %s", host, port, e)
             return None
 
+    def _get_session(self):
+        """Return the shared HTTP session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            import aiohttp
+            
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=DNS_CACHE_TTL),
+                read_bufsize=10 * 1024 * 1024,
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+        return self._session
+
     async def measure_bandwidth(self, host: str = "httpbin.org", size_kb: int = 100) -> Optional[float]:
         """Estimate download bandwidth"""
+        import aiohttp
+        
         try:
-            import aiohttp
+            session = self._get_session()
             
             url = f"https://{host}/bytes/{size_kb * 1024}"
-            start_time = time.time()
+            start_time = time.perf_counter()
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    data = await response.read()
+            # Count bytes as they stream in instead of buffering the whole body
+            total_bytes = 0
+            async with session.get(url) as response:
+                async for chunk in response.content.iter_chunked(1 << 20):
+                    total_bytes += len(chunk)
                     
-            duration = time.time() - start_time
-            bandwidth_kbps = (len(data) * 8) / (duration * 1000)  # Kbps
+            duration = time.perf_counter() - start_time
+            bandwidth_kbps = (total_bytes * 8) / (duration * 1000)  # Kbps
             
             return bandwidth_kbps
             
-        except Exception as e:
-            print(f"❌ Bandwidth test failed: {e}")
+        except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+            logger.debug("bandwidth test failed: %s", e)
             return None
 
+    def _record_latency(self, target: str, latency: Optional[float]):
+        """Append a ping sample to the target's latency array"""
+        if np is None:
+            return
+        
+        idx = self._latency_idx[target]
+        arr = self._latency_arr[target]
+        if idx == len(arr):
+            arr = self._latency_arr[target] = np.resize(arr, len(arr) * 2)
+        
+        arr[idx] = np.nan if latency is None else latency
+        self._latency_idx[target] = idx + 1
+
+    def latency_summary(self) -> Dict[str, Dict[str, float]]:
+        """Per-target ping statistics over the whole run (requires numpy)"""
+        summary = {}
+        if np is None:
+            return summary
+        
+        for target, arr in self._latency_arr.items():
+            samples = arr[:self._latency_idx[target]]
+            if not samples.size:
+                continue
+            
+            lost = np.isnan(samples)
+            received = samples[~lost]
+            entry = {"samples": int(samples.size), "loss": float(lost.mean() * 100)}
+            if received.size:
+                entry["min"] = float(received.min())
+                entry["mean"] = float(received.mean())
+                entry["p95"] = float(np.percentile(received, 95))
+                entry["max"] = float(received.max())
+            summary[target] = entry
+        
+        return summary
+
+    async def _resolve_timed(self, host: str) -> float:
+        """Time an uncached DNS lookup in milliseconds"""
+        start_time = time.perf_counter()
+        await self._resolver.lookup(host)
+        return (time.perf_counter() - start_time) * 1000
+
     async def run_comprehensive_test(self) -> Dict:
         """Run all network tests"""
-        timestamp = datetime.now().isoformat()
         test_results = {
-            "timestamp": timestamp,
-            "ping_results": {},
-            "tcp_results": {},
-            "bandwidth": None,
-            "dns_resolution": {}
+            key: value.copy() if isinstance(value, dict) else value
+            for key, value in self._result_template.items()
         }
+        test_results["ts_ns"] = time.time_ns()
+        ping_out = test_results["ping_results"]
+        
+        # Resolve every target up front so DNS stays out of the individual probes
+        await asyncio.gather(
+            *(self._resolver.resolve(target) for target in self.targets),
+            return_exceptions=True
+        )
         
         # Ping tests
-        ping_tasks = [self.ping_host(target) for target in self.targets]
-        ping_results = await asyncio.gather(*ping_tasks, return_exceptions=True)
+        ping_results = await asyncio.gather(
+            *(self.ping_host(target) for target in self.targets),
+            return_exceptions=True
+        )
+        
+        for result in ping_results:
+            # Probe failures are reported as None, anything raised here is a bug
+            if isinstance(result, Exception) and not isinstance(result, (asyncio.TimeoutError, OSError)):
+                raise result
         
         for target, result in zip(self.targets, ping_results):
+            self._record_latency(target, None if isinstance(result, Exception) else result)
             if isinstance(result, Exception):
-                test_results["ping_results"][target] = None
                 self.stats["failed_pings"] += 1
             else:
-                test_results["ping_results"][target] = result
+                ping_out[target] = result
                 if result is not None:
                     self.stats["successful_pings"] += 1
+                    self._latency_sum += result
+                    self._latency_n += 1
                     self.stats["min_latency"] = min(self.stats["min_latency"], result)
                     self.stats["max_latency"] = max(self.stats["max_latency"], result)
                 else:
                     self.stats["failed_pings"] += 1
         
-        # TCP connection tests
-        tcp_targets = [
-            ("google.com", 80),
-            ("github.com", 443),
-            ("localhost", 9000)  # Our WebSocket server
-        ]
-        
-        for host, port in tcp_targets:
-            tcp_result = await self.test_tcp_connection(host, port)
-            test_results["tcp_results"][f"{host}:{port}"] = tcp_result
+        # TCP, bandwidth and DNS probes run concurrently
+        tcp_tasks = [asyncio.create_task(self.test_tcp_connection(host, port)) for host, port in TCP_TARGETS]
+        bw_task = asyncio.create_task(self.measure_bandwidth())
+        dns_tasks = [asyncio.create_task(self._resolve_timed(target)) for target in self._dns_targets]
         
-        # Bandwidth test
-        bandwidth = await self.measure_bandwidth()
-        test_results["bandwidth"] = bandwidth
+        probe_results = await asyncio.gather(*tcp_tasks, bw_task, *dns_tasks, return_exceptions=True)
+        for r in probe_results:
+            # Only a failed DNS lookup is expected to surface here
+            if isinstance(r, Exception) and not isinstance(r, (asyncio.TimeoutError, OSError)):
+                raise r
+        probe_results = [None if isinstance(r, Exception) else r for r in probe_results]
+        tcp_count = len(tcp_tasks)
         
-        # DNS resolution test
-        for target in self.targets[:2]:  # Test first 2 targets
-            try:
-                start_time = time.time()
-                socket.gethostbyname(target)
-                dns_time = (time.time() - start_time) * 1000
-                test_results["dns_resolution"][target] = dns_time
-            except Exception:
-                test_results["dns_resolution"][target] = None
+        test_results["tcp_results"].update(zip(self._tcp_keys, probe_results[:tcp_count]))
+        test_results["bandwidth"] = probe_results[tcp_count]
+        test_results["dns_resolution"].update(zip(self._dns_targets, probe_results[tcp_count + 1:]))
         
         self.stats["total_tests"] += 1
         self.results.append(test_results)
         
-        # Calculate average latency
-        valid_pings = [r for r in ping_results if r is not None and not isinstance(r, Exception)]
-        if valid_pings:
-            self.stats["avg_latency"] = statistics.mean(valid_pings)
+        # Running average over every successful ping
+        if self._latency_n:
+            self.stats["avg_latency"] = self._latency_sum / self._latency_n
         
         # Calculate packet loss
         if self.stats["total_tests"] > 0:
@@ -179,43 +496,69 @@ class NetworkMonitor:
         
         return test_results
 
-    def print_results(self, results: Dict):
-        """Print formatted test results"""
-        print(f"\n🔍 Network Test Results - {results['timestamp']}")
-        print("=" * 60)
+    def format_results(self, results: Dict) -> str:
+        """Render test results as a single printable block"""
+        parts = [
+            f"\n🔍 Network Test Results - {_fmt_ts(results['ts_ns'])}",
+            "=" * 60,
+            "📡 Ping Results:"
+        ]
         
         # Ping results
-        print("📡 Ping Results:")
         for target, latency in results["ping_results"].items():
             if latency is not None:
                 status = "🟢" if latency < 50 else "🟡" if latency < 100 else "🔴"
-                print(f"  {status} {target:<20} {latency:.1f}ms")
+                parts.append(f"  {status} {target:<20} {latency:.1f}ms")
             else:
-                print(f"  🔴 {target:<20} TIMEOUT")
+                parts.append(f"  🔴 {target:<20} TIMEOUT")
         
         # TCP results
-        print("\n🔌 TCP Connection Results:")
+        parts.append("\n🔌 TCP Connection Results:")
         for target, latency in results["tcp_results"].items():
             if latency is not None:
                 status = "🟢" if latency < 100 else "🟡" if latency < 200 else "🔴"
-                print(f"  {status} {target:<20} {latency:.1f}ms")
+                parts.append(f"  {status} {target:<20} {latency:.1f}ms")
             else:
-                print(f"  🔴 {target:<20} FAILED")
+                parts.append(f"  🔴 {target:<20} FAILED")
         
         # Bandwidth
         if results["bandwidth"]:
             bandwidth_mbps = results["bandwidth"] / 1000
             status = "🟢" if bandwidth_mbps > 10 else "🟡" if bandwidth_mbps > 1 else "🔴"
-            print(f"\n📊 Bandwidth: {status} {bandwidth_mbps:.2f} Mbps")
+            parts.append(f"\n📊 Bandwidth: {status} {bandwidth_mbps:.2f} Mbps")
         
         # DNS resolution
-        print("\n🌐 DNS Resolution:")
+        parts.append("\n🌐 DNS Resolution:")
         for target, dns_time in results["dns_resolution"].items():
             if dns_time is not None:
                 status = "🟢" if dns_time < 50 else "🟡" if dns_time < 100 else "🔴"
-                print(f"  {status} {target:<20} {dns_time:.1f}ms")
+                parts.append(f"  {status} {target:<20} {dns_time:.1f}ms")
             else:
-                print(f"  🔴 {target:<20} FAILED")
+                parts.append(f"  🔴 {target:<20} FAILED")
+        
+        parts.append("")
+        return "\n".join(parts)
+
+    def print_results(self, results: Dict):
+        """Print formatted test results"""
+        sys.stdout.write(self.format_results(results))
+        sys.stdout.flush()
+
+    def _printer(self):
+        """Print queued results off the event loop thread until a None sentinel arrives"""
+        while True:
+            results = self._print_q.get()
+            if results is None:
+                return
+            self.print_results(results)
+
+    async def aclose(self):
+        """Release the shared HTTP session, ICMP socket and DNS threads"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        self._pinger.close()
+        self._dns_pool.shutdown(wait=False, cancel_futures=True)
 
     def print_summary(self):
         """Print overall statistics"""
@@ -230,6 +573,15 @@ class NetworkMonitor:
             print(f"Min Latency: {self.stats['min_latency']:.1f}ms")
             print(f"Avg Latency: {self.stats['avg_latency']:.1f}ms")
             print(f"Max Latency: {self.stats['max_latency']:.1f}ms")
+        
+        summary = self.latency_summary()
+        if summary:
+            print("\n🎯 Per-Target Latency:")
+            for target, entry in summary.items():
+                if "mean" in entry:
+                    print(f"  {target:<20} avg {entry['mean']:.1f}ms  p95 {entry['p95']:.1f}ms  loss {entry['loss']:.1f}%")
+                else:
+                    print(f"  {target:<20} no replies  loss {entry['loss']:.1f}%")
 
     async def continuous_monitor(self, duration: Optional[int] = None):
         """Run continuous monitoring"""
@@ -240,13 +592,18 @@ class NetworkMonitor:
         print(f"📊 Testing every {self.interval} seconds")
         print("Press Ctrl+C to stop\n")
         
+        # Formatting and stdout writes happen on a separate thread
+        self._print_q = queue.SimpleQueue()
+        printer = threading.Thread(target=self._printer, name="result-printer", daemon=True)
+        printer.start()
+        
         try:
             while self.running:
                 if duration and (time.time() - start_time) > duration:
                     break
                 
                 results = await self.run_comprehensive_test()
-                self.print_results(results)
+                self._print_q.put(results)
                 
                 await asyncio.sleep(self.interval)
                 
@@ -254,16 +611,32 @@ class NetworkMonitor:
             print("\n⏹️  Monitoring stopped by user")
         finally:
             self.running = False
+            await self.aclose()
+            # Let queued results finish printing before the summary
+            self._print_q.put(None)
+            printer.join()
             self.print_summary()
 
     def save_results(self, filename: str = "network_results.json"):
         """Save results to JSON file"""
-        with open(filename, 'w') as f:
-            json.dump({
-                "results": self.results,
-                "stats": self.stats,
-                "generated_at": datetime.now().isoformat()
-            }, f, indent=2)
+        payload = {
+            "results": [{"timestamp": _fmt_ts(r["ts_ns"]), **r} for r in self.results],
+            "stats": self.stats,
+            "generated_at": _fmt_ts(time.time_ns())
+        }
+        
+        if orjson is None:
+            with open(filename, 'w') as f:
+                json.dump(payload, f, indent=2)
+        else:
+            # Serialize in C and hand the whole buffer to the kernel
+            buf = memoryview(orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                while buf:
+                    buf = buf[os.write(fd, buf):]
+            finally:
+                os.close(fd)
         print(f"💾 Results saved to {filename}")
 
     def analyze_remote_desktop_readiness(self) -> Dict[str, str]:
@@ -297,6 +670,12 @@ class NetworkMonitor:
             analysis["stability"] = "poor"
             analysis["recommendations"].append("High packet loss detected. Check network stability.")
         
+        for target, entry in self.latency_summary().items():
+            if entry.get("p95", 0) > 200:
+                analysis["recommendations"].append(
+                    f"Latency spikes to {entry['p95']:.0f}ms (p95) on {target}. Expect stutter during remote sessions."
+                )
+        
         # Overall assessment
         if analysis["latency"] in ["excellent", "good"] and analysis["stability"] in ["excellent", "good"]:
             analysis["overall"] = "ready"
@@ -314,9 +693,19 @@ async def main():
     parser.add_argument("--duration", type=int, help="Test duration in seconds")
     parser.add_argument("--output", help="Output file for results")
     parser.add_argument("--single", action="store_true", help="Run single test instead of continuous")
+    parser.add_argument("--verbose", action="store_true", help="Log individual probe failures")
     
     args = parser.parse_args()
     
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.WARNING,
+        format="%(levelname)s %(message)s"
+    )
+    
+    # Probes that finish without suspending (e.g. cache hits) skip the ready queue
+    if hasattr(asyncio, "eager_task_factory"):  # Python 3.12+
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+    
     monitor = NetworkMonitor(
         targets=args.targets,
         interval=args.interval
@@ -334,6 +723,8 @@ async def main():
             print("💡 Recommendations:")
             for rec in analysis["recommendations"]:
                 print(f"  • {rec}")
+        
+        await monitor.aclose()
     else:
         await monitor.continuous_monitor(duration=args.duration)
     
@@ -349,4 +740,10 @@ if __name__ == "__main__":
         subprocess.check_call(["pip", "install", "aiohttp"])
         import aiohttp
     
-    asyncio.run(main())
+    if uvloop is not None and hasattr(asyncio, "Runner"):  # Python 3.11+
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            runner.run(main())
+    else:
+        if uvloop is not None:
+            uvloop.install()
+        asyncio.run(main())
@@ -4,20 +4,95 @@ WebRTC Connection Analyzer
 Analyzes WebRTC connection quality and provides optimization recommendations
 """
 
-import json
 import asyncio
 import websockets
+from websockets.exceptions import WebSocketException
 import time
+import argparse
+from collections import Counter, deque
 from datetime import datetime
 from typing import Dict, List, Optional
 
+try:
+    import orjson
+except ImportError:
+    import json as orjson
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+PAYLOAD_WINDOW = 1024  # most recent messages kept when payload capture is enabled
+
+def _fmt_ts(ns: int) -> str:
+    """Format a time.time_ns() value as a local ISO 8601 timestamp"""
+    return datetime.fromtimestamp(ns / 1e9).astimezone().isoformat()
+
 class WebRTCAnalyzer:
-    def __init__(self, websocket_url: str = "ws://localhost:9000"):
+    def __init__(self, websocket_url: str = "ws://localhost:9000", send_interval: float = 0.01,
+                 keep_payloads: bool = False):
         self.websocket_url = websocket_url
-        self.connection_data = []
+        self.send_interval = send_interval
+        self.keep_payloads = keep_payloads
+        self.message_count = 0
+        # Running message statistics, so analysis never has to rescan stored messages
+        self._min_ts: Optional[int] = None
+        self._max_ts: Optional[int] = None
+        self._type_counts = Counter()
+        self.connection_data = deque(maxlen=PAYLOAD_WINDOW)
         self.ice_candidates = []
         self.connection_states = []
         
+    async def _sender(self, websocket, session_id: str, end_at: float):
+        """Send stats messages at a fixed rate until end_at"""
+        # Reuse one stats message, only the timestamp changes per send
+        stats_message = {
+            "t": "stats",
+            "s": session_id,
+            "d": {
+                "timestamp": 0.0,
+                "test_data": "performance_test"
+            }
+        }
+        stats_data = stats_message["d"]
+        
+        while time.time() < end_at:
+            stats_data["timestamp"] = time.time()
+            await websocket.send(orjson.dumps(stats_message))
+            await asyncio.sleep(self.send_interval)
+    
+    async def _drain(self, websocket):
+        """Parse and store every inbound message as it arrives"""
+        async for message in websocket:
+            self.message_count += 1
+            
+            try:
+                data = orjson.loads(message)
+            except ValueError:
+                continue
+            
+            now = time.time_ns()
+            if self._min_ts is None:
+                self._min_ts = now
+            self._max_ts = now
+            msg_type = data.get("t", "unknown")
+            self._type_counts[msg_type] += 1
+            
+            if self.keep_payloads:
+                self.connection_data.append({
+                    "ts_ns": now,
+                    "message_type": msg_type,
+                    "data": data
+                })
+    
+    async def _receiver(self, websocket, end_at: float):
+        """Drain inbound messages until end_at or until the server closes the connection"""
+        try:
+            await asyncio.wait_for(self._drain(websocket), timeout=max(0.0, end_at - time.time()))
+        except asyncio.TimeoutError:
+            pass
+    
     async def connect_and_analyze(self, duration: int = 30):
         """Connect to WebSocket server and analyze WebRTC performance"""
         print(f"🔍 Analyzing WebRTC performance for {duration} seconds...")
@@ -27,50 +102,26 @@ class WebRTCAnalyzer:
                 # Send test messages
                 test_session_id = f"test_{int(time.time())}"
                 
-                await websocket.send(json.dumps({
+                await websocket.send(orjson.dumps({
                     "t": "host-ready",
                     "s": test_session_id
                 }))
                 
-                start_time = time.time()
-                message_count = 0
+                end_at = time.time() + duration
+                self.message_count = 0
                 
-                while time.time() - start_time < duration:
-                    try:
-                        # Send periodic test messages
-                        await websocket.send(json.dumps({
-                            "t": "stats",
-                            "s": test_session_id,
-                            "d": {
-                                "timestamp": time.time(),
-                                "test_data": "performance_test"
-                            }
-                        }))
-                        
-                        # Try to receive messages
-                        message = await asyncio.wait_for(websocket.recv(), timeout=1.0)
-                        message_count += 1
-                        
-                        # Parse and store message data
-                        try:
-                            data = json.loads(message)
-                            self.connection_data.append({
-                                "timestamp": time.time(),
-                                "message_type": data.get("t"),
-                                "data": data
-                            })
-                        except json.JSONDecodeError:
-                            pass
-                            
-                    except asyncio.TimeoutError:
-                        # No message received, continue
-                        pass
-                    
-                    await asyncio.sleep(0.1)
+                send_task = asyncio.create_task(self._sender(websocket, test_session_id, end_at))
+                recv_task = asyncio.create_task(self._receiver(websocket, end_at))
+                try:
+                    await asyncio.gather(send_task, recv_task)
+                finally:
+                    # Don't leave one side running if the other failed
+                    send_task.cancel()
+                    recv_task.cancel()
                 
-                print(f"✅ Analysis complete. Processed {message_count} messages.")
+                print(f"✅ Analysis complete. Processed {self.message_count} messages.")
                 
-        except Exception as e:
+        except (asyncio.TimeoutError, OSError, WebSocketException) as e:
             print(f"❌ Connection failed: {e}")
             return False
         
@@ -78,31 +129,21 @@ class WebRTCAnalyzer:
     
     def analyze_performance(self) -> Dict:
         """Analyze collected performance data"""
-        if not self.connection_data:
+        if not self._type_counts:
             return {"error": "No data collected"}
         
         analysis = {
-            "total_messages": len(self.connection_data),
-            "message_types": {},
+            "total_messages": sum(self._type_counts.values()),
+            "message_types": dict(self._type_counts),
             "connection_quality": "unknown",
             "recommendations": [],
             "timestamps": {
-                "start": min(d["timestamp"] for d in self.connection_data),
-                "end": max(d["timestamp"] for d in self.connection_data),
-                "duration": 0
+                "start": _fmt_ts(self._min_ts),
+                "end": _fmt_ts(self._max_ts),
+                "duration": (self._max_ts - self._min_ts) / 1e9
             }
         }
         
-        # Calculate duration
-        analysis["timestamps"]["duration"] = (
-            analysis["timestamps"]["end"] - analysis["timestamps"]["start"]
-        )
-        
-        # Count message types
-        for data in self.connection_data:
-            msg_type = data.get("message_type", "unknown")
-            analysis["message_types"][msg_type] = analysis["message_types"].get(msg_type, 0) + 1
-        
         # Analyze message frequency
         if analysis["timestamps"]["duration"] > 0:
             msg_per_second = analysis["total_messages"] / analysis["timestamps"]["duration"]
@@ -138,6 +179,8 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 📊 Connection Statistics:
   • Total Messages: {analysis.get('total_messages', 0)}
   • Duration: {analysis.get('timestamps', {}).get('duration', 0):.2f} seconds
+  • First Message: {analysis.get('timestamps', {}).get('start', 'n/a')}
+  • Last Message: {analysis.get('timestamps', {}).get('end', 'n/a')}
   • Quality: {analysis.get('connection_quality', 'unknown').upper()}
 
 📈 Message Types:
@@ -154,7 +197,17 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         return report
 
 async def main():
-    analyzer = WebRTCAnalyzer()
+    parser = argparse.ArgumentParser(description="WebRTC Connection Analyzer")
+    parser.add_argument("--keep-payloads", action="store_true",
+                        help=f"Keep the last {PAYLOAD_WINDOW} received messages in memory")
+    
+    args = parser.parse_args()
+    
+    # Coroutines that finish without suspending skip the ready queue
+    if hasattr(asyncio, "eager_task_factory"):  # Python 3.12+
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+    
+    analyzer = WebRTCAnalyzer(keep_payloads=args.keep_payloads)
     
     print("🚀 Starting WebRTC Analysis...")
     success = await analyzer.connect_and_analyze(duration=15)
@@ -171,4 +224,10 @@ async def main():
         print("❌ Analysis failed - make sure the WebSocket server is running")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None and hasattr(asyncio, "Runner"):  # Python 3.11+
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            runner.run(main())
+    else:
+        if uvloop is not None:
+            uvloop.install()
+        asyncio.run(main())